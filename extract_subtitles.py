@@ -1,12 +1,31 @@
 import os
 import sys
+import shutil
 import subprocess
 import json
+import queue
 import threading
 import time
 import re
-from datetime import datetime, timedelta
-from typing import List, Dict, Optional, Tuple, Set
+import sqlite3
+import tempfile
+from concurrent.futures import ThreadPoolExecutor, as_completed, wait
+from datetime import datetime
+from functools import partial
+from types import MappingProxyType
+from typing import List, Dict, NamedTuple, Optional, Tuple, Set, Iterator
+
+# Faster parser for ffprobe's JSON output, if installed
+try:
+    import orjson as _json
+except ImportError:
+    _json = json
+
+# In-process probing through FFmpeg's libraries, if PyAV is installed
+try:
+    import av as _av
+except ImportError:
+    _av = None
 
 # GUI libraries
 import customtkinter as ctk
@@ -23,8 +42,8 @@ LANGUAGE_MAPPING = {
     "und": "Undefined"
 }
 
-# Supported output formats
-SUBTITLE_FORMATS = {
+# Supported output formats (read-only, shared by the worker threads)
+SUBTITLE_FORMATS = MappingProxyType({
     "SRT": {
         "extension": "srt",
         "ffmpeg_format": "srt",
@@ -45,13 +64,125 @@ SUBTITLE_FORMATS = {
         "ffmpeg_format": "webvtt",
         "description": "Web Video Text Tracks"
     }
-}
+})
+
+# Option menu choices, built once
+_LANG_CHOICES = tuple(LANGUAGE_MAPPING)
+_FORMAT_CHOICES = tuple(SUBTITLE_FORMATS)
+
+# Extraction tasks allowed to be queued or running at once; scanning waits
+# for a free slot so the task queue can't grow without bound
+MAX_PENDING_EXTRACTIONS = 64
+
+# Events (mostly log lines) applied to the GUI per tick of the event pump, and
+# the tick interval; a flood of log lines is spread over several ticks
+# instead of blocking the Tk main loop
+MAX_EVENTS_PER_PUMP = 200
+EVENT_PUMP_INTERVAL_MS = 100
+
+# How long the completion notification stays on screen
+TOAST_DURATION_MS = 4000
+
+# Number of subdirectory checkboxes shown at once in the selection list
+SUBDIR_VISIBLE_ROWS = 6
+
+# Video file extensions to look for (lowercase, without the dot)
+VIDEO_EXTENSIONS = frozenset({'mkv', 'mp4', 'avi', 'mov', 'wmv', 'flv', 'webm'})
+
+# Buffer size for ffmpeg/ffprobe output pipes (fewer read() calls than the 8 KiB default)
+PIPE_BUFFER_SIZE = 1024 * 1024
+
+# On Windows, don't allocate a console window for every ffmpeg/ffprobe process
+_CREATE_NO_WINDOW = getattr(subprocess, "CREATE_NO_WINDOW", 0)
+
+# On POSIX, start ffmpeg/ffprobe in their own session so a Ctrl-C in the
+# terminal running the GUI doesn't reach them; cancel() stops them instead
+_START_NEW_SESSION = os.name == "posix"
+
+# Arguments shared by every ffmpeg extraction command; -nostdin and
+# -hide_banner keep ffmpeg from touching stdin or padding stderr
+_FFMPEG_BASE_ARGS = ("-hide_banner", "-nostdin", "-loglevel", "warning")
+
+# Probe results of previous runs, reused while a file's mtime and size don't change
+PROBE_CACHE_PATH = os.path.join(os.path.expanduser("~"), ".cache", "subx", "probe.db")
+
+# Version of the probe cache layout; older caches are discarded when opened
+PROBE_CACHE_VERSION = 2
+
+# ffmpeg error message matched against its raw stderr output
+_ERR_UNKNOWN = b"Unknown encoder"
+
+class SubtitleStream(NamedTuple):
+    """A subtitle stream reported by the probe"""
+    index: int
+    codec_name: str
+    language: str
+    title: str
+
+def _fmt_hms(seconds: float) -> str:
+    """Format a duration as H:MM:SS (like str(timedelta), without building one)"""
+    minutes, seconds = divmod(int(seconds), 60)
+    hours, minutes = divmod(minutes, 60)
+    return f"{hours}:{minutes:02d}:{seconds:02d}"
+
+def is_video_file(filename: str) -> bool:
+    """Check if a filename has one of the supported video extensions"""
+    _, dot, extension = filename.rpartition('.')
+    return bool(dot) and extension.lower() in VIDEO_EXTENSIONS
+
+def walk_video_files(directory: str) -> Iterator[str]:
+    """
+    Recursively yield the video files under a directory
+    
+    Uses os.scandir so file types come from the directory listing itself
+    instead of a separate stat() call per entry. Symlinked directories are
+    not followed and unreadable directories are skipped, like os.walk.
+    """
+    pending = [directory]
+    while pending:
+        try:
+            with os.scandir(pending.pop()) as entries:
+                for entry in entries:
+                    if entry.is_dir(follow_symlinks=False):
+                        pending.append(entry.path)
+                    elif is_video_file(entry.name) and entry.is_file():
+                        yield entry.path
+        except OSError:
+            continue
 
 class SubtitleExtractor:
     """Core functionality for extracting subtitles from video files"""
     
-    def __init__(self, log_callback=None):
+    def __init__(self, log_callback=None, max_workers: Optional[int] = None):
         self.log_callback = log_callback
+        # Number of ffmpeg processes allowed to run at the same time
+        self.max_workers = max_workers or min(os.cpu_count() or 1, 8)
+        # Threads each ffmpeg process may use; the parallelism comes from running
+        # several processes, so more threads per process only oversubscribes the CPU
+        self.ffmpeg_threads_per_task = 1
+        # Number of ffprobe processes allowed to run at the same time; each one is
+        # a separate process, so more than one per core only competes with ffmpeg and the GUI
+        self.probe_workers = os.cpu_count() or 1
+        # Reused by every probe_all() call instead of spinning up new threads each run
+        self._probe_executor = ThreadPoolExecutor(
+            max_workers=self.probe_workers,
+            thread_name_prefix="ffprobe"
+        )
+        # Guards the statistics counters, which are updated from worker threads
+        self._lock = threading.Lock()
+        # On-disk probe cache shared by the probe threads (None if it can't be opened)
+        self._probe_cache = self._open_probe_cache(PROBE_CACHE_PATH)
+        self._probe_cache_lock = threading.Lock()
+        # Running ffmpeg processes, terminated by cancel()
+        self._processes: Set[subprocess.Popen] = set()
+        # Executables, replaced by their absolute paths once check_dependencies() finds them
+        self._ffmpeg = "ffmpeg"
+        self._ffprobe = "ffprobe"
+        self._deps_ok: Optional[bool] = None
+        # Files found in each output directory, listed once per run instead of
+        # a stat() per stream, and the output files claimed during this run
+        self._existing_outputs: Dict[str, Set[str]] = {}
+        self._claimed_outputs: Set[Tuple[str, str]] = set()
         self.cancel_flag = False
         self.total_streams = 0
         self.processed_streams = 0
@@ -67,80 +198,221 @@ class SubtitleExtractor:
             print(message)
     
     def check_dependencies(self) -> bool:
-        """Check if ffmpeg and ffprobe are available in the system"""
-        try:
-            subprocess.run(
-                ["ffmpeg", "-version"], 
-                stdout=subprocess.PIPE, 
-                stderr=subprocess.PIPE,
-                check=True
-            )
-            subprocess.run(
-                ["ffprobe", "-version"], 
-                stdout=subprocess.PIPE, 
-                stderr=subprocess.PIPE,
-                check=True
-            )
-            return True
-        except (subprocess.SubprocessError, FileNotFoundError):
+        """Check if ffmpeg and ffprobe are available in the system (result is cached)"""
+        if self._deps_ok is not None:
+            return self._deps_ok
+        
+        ffmpeg = shutil.which("ffmpeg")
+        ffprobe = shutil.which("ffprobe")
+        self._deps_ok = bool(ffmpeg and ffprobe)
+        if not self._deps_ok:
             self.log("ERROR: ffmpeg or ffprobe not found. Please install them and make sure they're in your PATH.")
             return False
+        
+        # Spawn the resolved paths so PATH isn't searched again for every process
+        self._ffmpeg, self._ffprobe = ffmpeg, ffprobe
+        return True
     
     def get_video_files(self, directory: str) -> List[str]:
         """Get all video files from directory"""
-        video_extensions = ('.mkv', '.mp4', '.avi', '.mov', '.wmv', '.flv', '.webm')
-        video_files = []
-        
-        for root, _, files in os.walk(directory):
-            for file in files:
-                if file.lower().endswith(video_extensions):
-                    video_files.append(os.path.join(root, file))
+        return list(walk_video_files(directory))
+    
+    def get_subtitle_streams(self, video_file: str, language: Optional[str] = None) -> List[SubtitleStream]:
+        """
+        Get all subtitle streams from video file
         
-        return video_files
+        Args:
+            video_file: Path to the video file
+            language: Only return the streams in this language (default: all streams)
+            
+        Returns:
+            List[SubtitleStream]: The subtitle streams of the file
+        """
+        streams = self._cached_streams(video_file)
+        if streams is None:
+            # Probing in-process avoids starting an ffprobe process per file
+            streams = self._probe_in_process(video_file) if _av is not None else None
+            if streams is None:
+                # Cached results must hold every language to be reused by later runs
+                streams = self._probe_with_ffprobe(
+                    video_file, language if self._probe_cache is None else None
+                )
+                if streams is None:
+                    return []
+            self._store_streams(video_file, streams)
+        
+        if language is not None:
+            # ffprobe may have filtered tagged languages already; this covers the rest
+            streams = [stream for stream in streams if stream.language == language]
+        return streams
     
-    def get_subtitle_streams(self, video_file: str) -> List[Dict]:
-        """Get all subtitle streams from video file"""
+    def _probe_with_ffprobe(self, video_file: str, language: Optional[str]) -> Optional[List[SubtitleStream]]:
+        """Get the subtitle streams by running ffprobe on the file, or None on failure"""
+        # Let ffprobe skip the other languages, except for 'und' which also
+        # stands for streams without a language tag
+        select_streams = "s"
+        if language is not None and language != "und":
+            select_streams = f"s:m:language:{language}"
+        
         try:
             # Run ffprobe to get stream information in JSON format
             result = subprocess.run(
                 [
-                    "ffprobe", 
+                    self._ffprobe, 
                     "-v", "quiet", 
+                    # Subtitle streams are declared in the container header,
+                    # so there is no need to read far into long files
+                    "-analyzeduration", "1M",
+                    "-probesize", "1M",
                     "-print_format", "json", 
-                    "-show_streams", 
-                    "-select_streams", "s", 
+                    # Only ask for the fields used below to keep the output small
+                    "-show_entries", "stream=index,codec_name:stream_tags=language,title",
+                    "-select_streams", select_streams, 
                     video_file
                 ],
+                stdin=subprocess.DEVNULL,
                 stdout=subprocess.PIPE,
                 stderr=subprocess.PIPE,
-                text=True,
-                errors='replace',  # Handle Unicode decode errors
+                bufsize=PIPE_BUFFER_SIZE,
+                creationflags=_CREATE_NO_WINDOW,
+                start_new_session=_START_NEW_SESSION,
                 check=False
             )
             
-            # Parse JSON output
-            streams_data = json.loads(result.stdout)
+            # A failed probe still prints "{}", which must not read as "no streams"
+            if result.returncode != 0:
+                self.log(f"ERROR: ffprobe failed for {os.path.basename(video_file)} (exit code {result.returncode})")
+                return None
+            
+            # Parse JSON output (raw bytes, both parsers handle the decoding)
+            streams_data = _json.loads(result.stdout)
             subtitle_streams = []
             
             # Extract relevant subtitle stream information
             if 'streams' in streams_data:
                 for stream in streams_data['streams']:
-                    stream_info = {
-                        'index': stream.get('index'),
-                        'codec_name': stream.get('codec_name', 'unknown'),
-                        'language': stream.get('tags', {}).get('language', 'und'),
-                        'title': stream.get('tags', {}).get('title', '')
-                    }
-                    subtitle_streams.append(stream_info)
+                    tags = stream.get('tags', {})
+                    subtitle_streams.append(SubtitleStream(
+                        index=stream.get('index'),
+                        codec_name=stream.get('codec_name', 'unknown'),
+                        language=tags.get('language', 'und'),
+                        title=tags.get('title', '')
+                    ))
             
             return subtitle_streams
         
         except subprocess.SubprocessError as e:
             self.log(f"ERROR: Failed to get subtitle streams from {os.path.basename(video_file)}: {str(e)}")
-            return []
+            return None
         except json.JSONDecodeError:
             self.log(f"ERROR: Failed to parse ffprobe output for {os.path.basename(video_file)}")
-            return []
+            return None
+    
+    def _probe_in_process(self, video_file: str) -> Optional[List[SubtitleStream]]:
+        """Get the subtitle streams with PyAV, or None to fall back to ffprobe"""
+        try:
+            with _av.open(video_file) as container:
+                return [
+                    SubtitleStream(
+                        index=stream.index,
+                        codec_name=stream.codec_context.name if stream.codec_context else 'unknown',
+                        language=stream.metadata.get('language', 'und'),
+                        title=stream.metadata.get('title', '')
+                    )
+                    for stream in container.streams.subtitles
+                ]
+        except Exception:
+            # Let ffprobe handle (and report) anything PyAV can't open
+            return None
+    
+    def _open_probe_cache(self, path: str) -> Optional[sqlite3.Connection]:
+        """Open (and create if needed) the probe cache database"""
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            connection = sqlite3.connect(path, check_same_thread=False)
+            connection.execute("PRAGMA journal_mode=WAL")
+            if connection.execute("PRAGMA user_version").fetchone()[0] != PROBE_CACHE_VERSION:
+                connection.execute("DROP TABLE IF EXISTS probe")
+                connection.execute(f"PRAGMA user_version = {PROBE_CACHE_VERSION}")
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS probe "
+                "(path TEXT PRIMARY KEY, mtime INTEGER, size INTEGER, streams BLOB)"
+            )
+            return connection
+        except (OSError, sqlite3.Error) as e:
+            # The cache is only an optimization; probe every file without it
+            self.log(f"WARNING: Probe cache unavailable: {str(e)}")
+            return None
+    
+    def _cached_streams(self, video_file: str) -> Optional[List[SubtitleStream]]:
+        """Get the cached subtitle streams of a file, or None if missing or stale"""
+        if self._probe_cache is None:
+            return None
+        try:
+            stat = os.stat(video_file)
+            with self._probe_cache_lock:
+                row = self._probe_cache.execute(
+                    "SELECT mtime, size, streams FROM probe WHERE path = ?",
+                    (os.path.abspath(video_file),)
+                ).fetchone()
+        except (OSError, sqlite3.Error):
+            return None
+        
+        if row is None or row[0] != stat.st_mtime_ns or row[1] != stat.st_size:
+            return None
+        try:
+            rows = _json.loads(row[2])
+            if not isinstance(rows, list):
+                return None
+            return [SubtitleStream(*fields) for fields in rows]
+        except (ValueError, TypeError):
+            # A damaged row is just a cache miss; probing again replaces it
+            return None
+    
+    def _store_streams(self, video_file: str, streams: List[SubtitleStream]):
+        """Cache the subtitle streams of a file for later runs"""
+        if self._probe_cache is None:
+            return
+        try:
+            stat = os.stat(video_file)
+            with self._probe_cache_lock, self._probe_cache:
+                self._probe_cache.execute(
+                    "INSERT OR REPLACE INTO probe VALUES (?, ?, ?, ?)",
+                    (os.path.abspath(video_file), stat.st_mtime_ns, stat.st_size,
+                     _json.dumps([tuple(stream) for stream in streams]))
+                )
+        except (OSError, sqlite3.Error):
+            pass
+    
+    def probe_all(
+        self,
+        video_files: List[str],
+        language: Optional[str] = None
+    ) -> Iterator[Tuple[str, List[SubtitleStream]]]:
+        """
+        Get the subtitle streams of many video files concurrently
+        
+        Results are yielded as soon as each probe finishes, so callers can start
+        working on a file without waiting for the rest of the batch.
+        
+        Args:
+            video_files: Paths of the video files to probe
+            language: Only report the streams in this language (default: all streams)
+            
+        Yields:
+            Tuple[str, List[SubtitleStream]]: The video file and its subtitle streams
+        """
+        futures = {
+            self._probe_executor.submit(self.get_subtitle_streams, video_file, language): video_file
+            for video_file in video_files
+        }
+        try:
+            for future in as_completed(futures):
+                yield futures[future], future.result()
+        finally:
+            # Don't start new probes if the caller stopped early
+            for future in futures:
+                future.cancel()
     
     def extract_subtitle(
         self,
@@ -165,115 +437,279 @@ class SubtitleExtractor:
         Returns:
             bool: True if extraction was successful
         """
-        # Get output directory and base filename
         video_basename = os.path.splitext(os.path.basename(video_file))[0]
-        if output_dir is None:
-            output_dir = os.path.dirname(video_file)
-            
-        # Create output directory if it doesn't exist
-        os.makedirs(output_dir, exist_ok=True)
         
         # Get format information
         if output_format not in SUBTITLE_FORMATS:
             self.log(f"ERROR: Unsupported format {output_format}")
-            self.failed_extractions += 1
+            with self._lock:
+                self.failed_extractions += 1
             return False
             
-        format_info = SUBTITLE_FORMATS[output_format]
-        extension = format_info["extension"]
-        ffmpeg_format = format_info["ffmpeg_format"]
+        ffmpeg_format = SUBTITLE_FORMATS[output_format]["ffmpeg_format"]
         
-        # Create output filename
-        output_file = os.path.join(output_dir, f"{video_basename}.{language}.{extension}")
+        # Get output filename and create the output directory if it doesn't exist
+        output_file = self.output_path_for(video_file, language, output_format, output_dir)
+        output_dir, output_name = os.path.split(output_file)
+        os.makedirs(output_dir, exist_ok=True)
         
         # Check if file already exists
-        if os.path.exists(output_file) and not overwrite:
+        if not self._claim_output(output_dir, output_name, overwrite):
             self.log(f"SKIPPED: Subtitle file already exists for {video_basename} [{language}]")
-            self.skipped_extractions += 1
+            with self._lock:
+                self.skipped_extractions += 1
             return False
+        
+        # ffmpeg writes to a temporary file in the same directory, which replaces
+        # the output only once it is complete; a failed or cancelled extraction
+        # never truncates or leaves behind a subtitle file
+        output_stem, output_extension = os.path.splitext(output_name)
+        fd, temp_file = tempfile.mkstemp(
+            prefix=f".{output_stem}.", suffix=f".part{output_extension}", dir=output_dir
+        )
+        os.close(fd)
+        output_files = self._written_files(output_file, ffmpeg_format)
+        temp_files = self._written_files(temp_file, ffmpeg_format)
             
-        # Build ffmpeg command based on format
-        cmd = [
-            "ffmpeg",
-            "-loglevel", "warning",  # Reduce verbosity
-            "-y" if overwrite else "-n",  # Overwrite or not
+        # Build ffmpeg command (for VobSub, ffmpeg writes the .sub next to the .idx)
+        cmd = (
+            self._ffmpeg,
+            *_FFMPEG_BASE_ARGS,
+            "-threads", str(self.ffmpeg_threads_per_task),
+            "-y",  # The temporary file was created by mkstemp
             "-i", video_file,
             "-map", f"0:{stream_index}",
             "-c:s", ffmpeg_format,
-        ]
-        
-        # Add format-specific parameters
-        if output_format == "VobSub":
-            # VobSub requires both .idx and .sub files
-            cmd.extend([output_file])
-        else:
-            # Other formats use a single file
-            cmd.extend([output_file])
+            temp_file,
+        )
         
         try:
             # Run ffmpeg command
             process = subprocess.Popen(
                 cmd,
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE,
-                text=True,
-                errors='replace'  # Handle Unicode decode errors
+                stdin=subprocess.DEVNULL,
+                stdout=subprocess.DEVNULL,  # Subtitles are written to temp_file
+                stderr=subprocess.PIPE,  # Kept as bytes, no decoding needed
+                bufsize=PIPE_BUFFER_SIZE,
+                creationflags=_CREATE_NO_WINDOW,
+                start_new_session=_START_NEW_SESSION
             )
             
-            # Read and parse stderr output for progress information
-            stderr_lines = []
-            for line in process.stderr:
-                stderr_lines.append(line)
-                if "time=" in line:
-                    # Could extract progress here if needed
-                    pass
-                    
-                # Check for cancel flag
+            # Register the process so cancel() can terminate it right away
+            with self._lock:
+                self._processes.add(process)
                 if self.cancel_flag:
                     process.terminate()
-                    self.log(f"CANCELLED: Extraction cancelled for {video_basename} [{language}]")
-                    return False
             
-            # Wait for process to complete
-            return_code = process.wait()
+            try:
+                # Wait for process to complete, keeping stderr for error classification
+                _, error_output = process.communicate()
+                return_code = process.returncode
+            finally:
+                with self._lock:
+                    self._processes.discard(process)
+            
+            if return_code != 0 and self.cancel_flag:
+                self.log(f"CANCELLED: Extraction cancelled for {video_basename} [{language}]")
+                return False
             
             if return_code != 0:
-                error_output = ''.join(stderr_lines)
-                
                 # Check for common errors and provide more specific messages
-                if "Unknown encoder" in error_output:
+                if _ERR_UNKNOWN in error_output:
                     self.log(f"ERROR: Format mismatch or unsupported format for {video_basename} [{language}]")
-                elif "Output file exists" in error_output:
-                    self.log(f"SKIPPED: Subtitle file already exists for {video_basename} [{language}]")
-                    self.skipped_extractions += 1
                 else:
-                    self.log(f"ERROR: Failed to extract subtitle from {video_basename} [{language}]")
+                    # Decode ffmpeg's output only here, to report its last error line
+                    details = error_output.decode('utf-8', errors='replace').strip().splitlines()
+                    reason = f": {details[-1]}" if details else ""
+                    self.log(f"ERROR: Failed to extract subtitle from {video_basename} [{language}]{reason}")
                     
-                self.failed_extractions += 1
+                with self._lock:
+                    self.failed_extractions += 1
+                return False
+            
+            # Another file may have been written to the same name since the run started
+            if not overwrite and any(os.path.exists(path) for path in output_files):
+                self.log(f"SKIPPED: Subtitle file already exists for {video_basename} [{language}]")
+                with self._lock:
+                    self.skipped_extractions += 1
+                return False
+            
+            # Move the finished files into place, the .idx of VobSub last
+            try:
+                for temp_path, path in reversed(list(zip(temp_files, output_files))):
+                    os.replace(temp_path, path)
+            except OSError as e:
+                self.log(f"ERROR: Failed to save subtitle file for {video_basename} [{language}]: {str(e)}")
+                with self._lock:
+                    self.failed_extractions += 1
                 return False
             
             self.log(f"SUCCESS: Extracted {output_format} subtitle for {video_basename} [{language}]")
-            self.successful_extractions += 1
+            with self._lock:
+                self.successful_extractions += 1
             return True
             
         except subprocess.SubprocessError as e:
             self.log(f"ERROR: Failed to run ffmpeg for {video_basename} [{language}]: {str(e)}")
-            self.failed_extractions += 1
+            with self._lock:
+                self.failed_extractions += 1
             return False
+        finally:
+            # Whatever wasn't moved into place is incomplete or unwanted
+            self._remove_temp_files(temp_files)
+    
+    def record_failure(self):
+        """Count an extraction that failed outside extract_subtitle()'s own error handling"""
+        with self._lock:
+            self.failed_extractions += 1
+    
+    def _written_files(self, output_file: str, ffmpeg_format: str) -> List[str]:
+        """Get the files ffmpeg writes for an output file (VobSub adds a .sub next to the .idx)"""
+        if ffmpeg_format == "dvdsub":
+            return [output_file, os.path.splitext(output_file)[0] + ".sub"]
+        return [output_file]
+    
+    def _remove_temp_files(self, temp_files: List[str]):
+        """Delete the temporary files of an extraction that weren't moved into place"""
+        for path in temp_files:
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            except OSError as e:
+                self.log(f"WARNING: Could not remove temporary file {os.path.basename(path)}: {str(e)}")
+    
+    def output_path_for(
+        self,
+        video_file: str,
+        language: str,
+        output_format: str,
+        output_dir: Optional[str] = None
+    ) -> str:
+        """Get the subtitle file path extract_subtitle() writes for a video file"""
+        video_basename = os.path.splitext(os.path.basename(video_file))[0]
+        if output_dir is None:
+            output_dir = os.path.dirname(video_file)
+        extension = SUBTITLE_FORMATS[output_format]["extension"]
+        return os.path.join(output_dir, ".".join((video_basename, language, extension)))
+    
+    def filter_existing(
+        self,
+        video_files: List[str],
+        language: str,
+        output_format: str,
+        output_dir: Optional[str] = None
+    ) -> List[str]:
+        """
+        Drop the video files whose subtitle file already exists
+        
+        Every stream of such a file would be skipped anyway, so filtering them
+        out before probing avoids spawning any process for them. Each dropped
+        file is logged and counted as skipped.
+        
+        Returns:
+            List[str]: The video files that still need to be processed
+        """
+        if output_format not in SUBTITLE_FORMATS:
+            return list(video_files)
+        
+        remaining = []
+        for video_file in video_files:
+            output_dir_for_file, output_name = os.path.split(
+                self.output_path_for(video_file, language, output_format, output_dir)
+            )
+            with self._lock:
+                exists = os.path.normcase(output_name) in self._listed_outputs(output_dir_for_file)
+            
+            if exists:
+                video_basename = os.path.splitext(os.path.basename(video_file))[0]
+                self.log(f"SKIPPED: Subtitle file already exists for {video_basename} [{language}]")
+                with self._lock:
+                    self.skipped_extractions += 1
+            else:
+                remaining.append(video_file)
+        
+        return remaining
+    
+    def drop_duplicate_outputs(self, video_file: str, streams: List[SubtitleStream], language: str) -> List[SubtitleStream]:
+        """
+        Keep only the first of a file's streams in the given language
+        
+        All of them would be written to the same output file, so the others
+        would only be skipped by extract_subtitle() after being queued. Each
+        dropped stream is logged and counted as skipped.
+        
+        Returns:
+            List[SubtitleStream]: The streams that still need to be extracted
+        """
+        if len(streams) < 2:
+            return streams
+        
+        video_basename = os.path.splitext(os.path.basename(video_file))[0]
+        for stream in streams[1:]:
+            self.log(f"SKIPPED: Stream {stream.index} of {video_basename} [{language}] has the same output file as stream {streams[0].index}")
+        with self._lock:
+            self.skipped_extractions += len(streams) - 1
+        return streams[:1]
+    
+    def _listed_outputs(self, output_dir: str) -> Set[str]:
+        """Get the (normcased) file names in an output directory, listed once per run; needs self._lock"""
+        existing = self._existing_outputs.get(output_dir)
+        if existing is None:
+            try:
+                with os.scandir(output_dir) as entries:
+                    existing = {os.path.normcase(entry.name) for entry in entries if entry.is_file()}
+            except OSError:
+                # Custom output directory that extract_subtitle() hasn't created yet
+                # (or can't use, which it reports for each stream)
+                existing = set()
+            self._existing_outputs[output_dir] = existing
+        return existing
+    
+    def _claim_output(self, output_dir: str, output_name: str, overwrite: bool) -> bool:
+        """
+        Reserve an output file for the current run
+        
+        Returns False if the file already exists and overwrite is disabled, or
+        if another extraction in this run (e.g. a second stream in the same
+        language) already writes to it.
+        """
+        filename = os.path.normcase(output_name)
+        with self._lock:
+            existing = self._listed_outputs(output_dir)
+            claim = (output_dir, filename)
+            if claim in self._claimed_outputs or (filename in existing and not overwrite):
+                return False
+            
+            self._claimed_outputs.add(claim)
+            return True
     
     def reset(self):
         """Reset the extractor state"""
         self.cancel_flag = False
+        self._existing_outputs.clear()
+        self._claimed_outputs.clear()
         self.total_streams = 0
         self.processed_streams = 0
         self.successful_extractions = 0
         self.failed_extractions = 0
         self.skipped_extractions = 0
     
+    def close(self):
+        """Shut down the probe worker threads and the probe cache"""
+        self._probe_executor.shutdown(wait=False)
+        if self._probe_cache is not None:
+            # Probes still finishing get sqlite3.Error and just skip the cache
+            with self._probe_cache_lock:
+                self._probe_cache.close()
+    
     def cancel(self):
         """Cancel the extraction process"""
         self.cancel_flag = True
-        self.log("INFO: Cancellation requested. Waiting for current task to complete...")
+        with self._lock:
+            for process in self._processes:
+                process.terminate()
+        self.log("INFO: Cancellation requested. Stopping running extractions...")
 
 
 class SubtitleExtractorGUI(ctk.CTk):
@@ -282,6 +718,12 @@ class SubtitleExtractorGUI(ctk.CTk):
     def __init__(self):
         super().__init__()
         
+        # Events posted by worker threads ("log", "finish"), applied by _pump_events
+        self._events = queue.SimpleQueue()
+        # Latest progress posted by worker threads, drawn by _drain_progress
+        self._latest_progress = None
+        self._latest_progress_lock = threading.Lock()
+        
         # Initialize the subtitle extractor
         self.extractor = SubtitleExtractor(log_callback=self.log_message)
         
@@ -303,9 +745,23 @@ class SubtitleExtractorGUI(ctk.CTk):
         # Create layout frames
         self.create_layout()
         
-        # Thread for extraction
-        self.extraction_thread = None
+        # Persistent worker threads: one runs the extraction session, the
+        # others run the ffmpeg extractions it submits
+        self.pool = ThreadPoolExecutor(
+            max_workers=self.extractor.max_workers + 1,
+            thread_name_prefix="subx"
+        )
+        self.extraction_future = None
+        # Extraction tasks submitted by the current session
+        self._extraction_tasks = []
         self.start_time = None
+        self._progress_lock = threading.Lock()
+        # Completion notification currently shown, if any
+        self._toast = None
+        
+        # Periodically apply the events and progress posted by worker threads
+        self.after(EVENT_PUMP_INTERVAL_MS, self._pump_events)
+        self.after(33, self._drain_progress)
         
         # Check dependencies
         if not self.extractor.check_dependencies():
@@ -314,6 +770,19 @@ class SubtitleExtractorGUI(ctk.CTk):
                 "ffmpeg or ffprobe not found. Please install them and make sure they're in your PATH."
             )
     
+    def destroy(self):
+        """Stop any running extraction and release the worker threads when the window is closed"""
+        # Pool threads aren't daemons, so don't leave ffmpeg processes for them to wait on
+        if self.extraction_future and not self.extraction_future.done():
+            self.extractor.cancel()
+        # Drop the queued tasks too (shutdown() can't do it before Python 3.9)
+        for future in [self.extraction_future, *self._extraction_tasks]:
+            if future is not None:
+                future.cancel()
+        self.pool.shutdown(wait=False)
+        self.extractor.close()
+        super().destroy()
+    
     def create_layout(self):
         """Create the application layout"""
         # Create a main frame that will contain all elements in a vertical layout
@@ -398,9 +867,26 @@ class SubtitleExtractorGUI(ctk.CTk):
             width=100
         ).pack(side="left", padx=5, pady=5)
         
-        # Scrollable frame for subdirectories (fixed height to prevent overlapping)
-        self.subdir_scrollable = ctk.CTkScrollableFrame(self.subdir_frame, height=150)
-        self.subdir_scrollable.grid(row=1, column=0, padx=5, pady=5, sticky="ew")
+        # Subdirectory list: a fixed set of checkboxes rebound to the entries
+        # scrolled into view, so large trees don't need a widget per directory
+        subdir_list = ctk.CTkFrame(self.subdir_frame, fg_color="transparent")
+        subdir_list.grid(row=1, column=0, padx=5, pady=5, sticky="ew")
+        subdir_list.grid_columnconfigure(0, weight=1)
+        
+        self.subdirs = []
+        self.subdir_labels = []
+        self.subdir_vars = {}
+        self.subdir_offset = 0
+        self.subdir_checks = []
+        for row in range(SUBDIR_VISIBLE_ROWS):
+            check = ctk.CTkCheckBox(subdir_list, text="")
+            check.grid(row=row, column=0, padx=5, pady=2, sticky="w")
+            for sequence in ("<MouseWheel>", "<Button-4>", "<Button-5>"):
+                check.bind(sequence, self.on_subdir_mousewheel)
+            self.subdir_checks.append(check)
+        
+        self.subdir_scrollbar = ctk.CTkScrollbar(subdir_list, command=self.on_subdir_scroll)
+        self.subdir_scrollbar.grid(row=0, column=1, rowspan=SUBDIR_VISIBLE_ROWS, padx=5, sticky="ns")
         
         # Hide the subdirectory frame initially
         self.subdir_frame.grid_remove()
@@ -417,7 +903,7 @@ class SubtitleExtractorGUI(ctk.CTk):
         language_menu = ctk.CTkOptionMenu(
             options_frame,
             variable=self.language_var,
-            values=list(LANGUAGE_MAPPING.keys()),
+            values=_LANG_CHOICES,
             dynamic_resizing=False,
             command=self.on_language_change,
             width=150
@@ -434,7 +920,7 @@ class SubtitleExtractorGUI(ctk.CTk):
         format_menu = ctk.CTkOptionMenu(
             options_frame,
             variable=self.format_var,
-            values=list(SUBTITLE_FORMATS.keys()),
+            values=_FORMAT_CHOICES,
             dynamic_resizing=False,
             width=150
         )
@@ -554,56 +1040,47 @@ class SubtitleExtractorGUI(ctk.CTk):
     
     def populate_subdirectories(self, directory):
         """Populate the subdirectory list"""
-        # Clear existing checkboxes
-        for widget in self.subdir_scrollable.winfo_children():
-            widget.destroy()
-        
         # Find all subdirectories
         self.subdirs = []
+        self.subdir_labels = []
         self.subdir_vars = {}
         
         try:
             # Start with the root directory itself
-            root_var = BooleanVar(value=True)
-            root_check = ctk.CTkCheckBox(
-                self.subdir_scrollable,
-                text=os.path.basename(directory) + " (root)",
-                variable=root_var
-            )
-            root_check.pack(anchor="w", padx=5, pady=2)
-            self.subdir_vars[directory] = root_var
+            self.subdir_vars[directory] = BooleanVar(value=True)
             self.subdirs.append(directory)
+            self.subdir_labels.append(os.path.basename(directory) + " (root)")
             
             # Reset selected subdirectories list when changing directory
             self.selected_subdirs = []
             
-            # Add subdirectories
-            for root, dirs, _ in os.walk(directory):
-                for dir_name in dirs:
-                    full_path = os.path.join(root, dir_name)
-                    rel_path = os.path.relpath(full_path, directory)
-                    
-                    # Check if this directory contains video files
-                    has_videos = False
-                    for _, _, files in os.walk(full_path):
-                        if any(file.lower().endswith(('.mkv', '.mp4', '.avi', '.mov')) for file in files):
-                            has_videos = True
-                            break
-                    
-                    if has_videos:
-                        var = BooleanVar(value=True)
-                        check = ctk.CTkCheckBox(
-                            self.subdir_scrollable,
-                            text=rel_path,
-                            variable=var
-                        )
-                        check.pack(anchor="w", padx=5, pady=2)
-                        self.subdir_vars[full_path] = var
-                        self.subdirs.append(full_path)
+            # Mark every subdirectory that contains video files, directly or below it
+            root_dir = os.path.normpath(directory)
+            has_videos = set()
+            for video_file in walk_video_files(root_dir):
+                parent = os.path.dirname(video_file)
+                while parent != root_dir and parent not in has_videos:
+                    has_videos.add(parent)
+                    parent = os.path.dirname(parent)
+            
+            video_dirs = sorted(
+                has_videos,
+                key=lambda path: os.path.relpath(path, root_dir).split(os.sep)
+            )
+            
+            # Add subdirectories (checkboxes are only bound to them while visible)
+            for full_path in video_dirs:
+                self.subdir_vars[full_path] = BooleanVar(value=True)
+                self.subdirs.append(full_path)
+                self.subdir_labels.append(os.path.relpath(full_path, directory))
         
         except Exception as e:
             self.log_message(f"ERROR: Failed to scan subdirectories: {str(e)}")
         
+        # Scroll back to the top of the new list
+        self.subdir_offset = 0
+        self.refresh_subdir_rows()
+        
         # Show the subdirectory frame if we have subdirectories
         if self.subdirs:
             self.subdir_frame.grid()
@@ -613,6 +1090,42 @@ class SubtitleExtractorGUI(ctk.CTk):
             self.subdir_frame.grid_remove()
             self.log_message("No subdirectories with video files found.")
     
+    def refresh_subdir_rows(self):
+        """Bind the checkboxes to the subdirectories currently scrolled into view"""
+        total = len(self.subdirs)
+        for row, check in enumerate(self.subdir_checks):
+            index = self.subdir_offset + row
+            if index < total:
+                check.configure(text=self.subdir_labels[index], variable=self.subdir_vars[self.subdirs[index]])
+                check.grid()
+            else:
+                check.configure(text="", variable=None)
+                check.grid_remove()
+        
+        if total > SUBDIR_VISIBLE_ROWS:
+            self.subdir_scrollbar.set(self.subdir_offset / total, (self.subdir_offset + SUBDIR_VISIBLE_ROWS) / total)
+        else:
+            self.subdir_scrollbar.set(0.0, 1.0)
+    
+    def on_subdir_scroll(self, action, amount, unit=None):
+        """Handle scrollbar drags ('moveto') and scroll steps ('scroll') on the subdirectory list"""
+        if action == "moveto":
+            offset = round(float(amount) * len(self.subdirs))
+        else:
+            offset = self.subdir_offset + int(amount)
+        
+        max_offset = max(0, len(self.subdirs) - SUBDIR_VISIBLE_ROWS)
+        offset = min(max(offset, 0), max_offset)
+        if offset != self.subdir_offset:
+            self.subdir_offset = offset
+            self.refresh_subdir_rows()
+    
+    def on_subdir_mousewheel(self, event):
+        """Scroll the subdirectory list with the mouse wheel"""
+        # Linux reports the wheel as buttons 4/5, Windows and macOS through event.delta
+        step = -1 if event.num == 4 or event.delta > 0 else 1
+        self.on_subdir_scroll("scroll", step)
+    
     def select_all_subdirs(self):
         """Select all subdirectories"""
         for var in self.subdir_vars.values():
@@ -645,7 +1158,7 @@ class SubtitleExtractorGUI(ctk.CTk):
         # Visual feedback - change apply button color briefly
         original_color = self.apply_btn.cget("fg_color")
         self.apply_btn.configure(fg_color="#4BB543")  # Bright green
-        self.after(500, lambda: self.apply_btn.configure(fg_color=original_color))
+        self.after(500, partial(self.apply_btn.configure, fg_color=original_color))
     
     def get_selected_subdirs(self) -> List[str]:
         """Get list of selected subdirectories"""
@@ -669,14 +1182,35 @@ class SubtitleExtractorGUI(ctk.CTk):
         return self.language_var.get()
     
     def log_message(self, message):
-        """Add a message to the log text area"""
+        """Queue a message for the log text area (safe to call from any thread)"""
         # Add timestamp
         timestamp = datetime.now().strftime("%H:%M:%S")
-        full_message = f"[{timestamp}] {message}\n"
+        self._events.put(("log", f"[{timestamp}] {message}\n"))
+    
+    def _pump_events(self):
+        """Apply the events posted by worker threads to the widgets in one batch"""
+        lines = []
+        finished = False
+        for _ in range(MAX_EVENTS_PER_PUMP):
+            try:
+                event = self._events.get_nowait()
+            except queue.Empty:
+                break
+            
+            if event[0] == "log":
+                lines.append(event[1])
+            elif event[0] == "finish":
+                finished = True
         
-        # Insert at the end and scroll to show the latest message
-        self.log_text.insert("end", full_message)
-        self.log_text.see("end")
+        if lines:
+            # Insert at the end and scroll to show the latest message
+            self.log_text.insert("end", "".join(lines))
+            self.log_text.see("end")
+        
+        if finished:
+            self.finish_extraction()
+        
+        self.after(EVENT_PUMP_INTERVAL_MS, self._pump_events)
     
     def update_progress(self, current, total):
         """Update the progress bar and labels"""
@@ -690,12 +1224,12 @@ class SubtitleExtractorGUI(ctk.CTk):
             # Update time information
             if self.start_time is not None:
                 elapsed = time.time() - self.start_time
-                elapsed_str = str(timedelta(seconds=int(elapsed))).split('.')[0]
+                elapsed_str = _fmt_hms(elapsed)
                 
                 # Calculate estimated remaining time
                 if current > 0:
                     remaining = (elapsed / current) * (total - current)
-                    remaining_str = str(timedelta(seconds=int(remaining))).split('.')[0]
+                    remaining_str = _fmt_hms(remaining)
                 else:
                     remaining_str = "--:--"
                 
@@ -738,7 +1272,9 @@ class SubtitleExtractorGUI(ctk.CTk):
                 messagebox.showwarning("Warning", "Please select an output directory.")
                 return
         
-        # Clear log before starting new extraction
+        # Clear log before starting new extraction, including lines not shown yet
+        while not self._events.empty():
+            self._events.get_nowait()
         self.log_text.delete("1.0", "end")
         self.log_message(f"Starting extraction for {len(self.selected_subdirs)} directories, language: {language}, format: {output_format}")
         
@@ -753,16 +1289,15 @@ class SubtitleExtractorGUI(ctk.CTk):
         self.time_label.configure(text="Elapsed: 00:00 | Remaining: --:--")
         self.start_time = time.time()
         
-        # Start extraction in a thread
-        self.extraction_thread = threading.Thread(
-            target=self.run_extraction,
-            args=(self.selected_subdirs, language, output_format, output_dir)
+        # Start extraction on the worker pool
+        self.extraction_future = self.pool.submit(
+            self.run_extraction,
+            self.selected_subdirs, language, output_format, output_dir, self.overwrite_var.get()
         )
-        self.extraction_thread.daemon = True
-        self.extraction_thread.start()
     
-    def run_extraction(self, directories, language, output_format, output_dir=None):
+    def run_extraction(self, directories, language, output_format, output_dir=None, overwrite=False):
         """Run the extraction process in a background thread"""
+        futures = self._extraction_tasks = []
         try:
             # Get all video files
             video_files = []
@@ -771,69 +1306,74 @@ class SubtitleExtractorGUI(ctk.CTk):
             
             if not video_files:
                 self.log_message("No video files found in the selected directories.")
-                self.finish_extraction()
                 return
             
             self.log_message(f"Found {len(video_files)} video files.")
             
-            # Scan for subtitle streams
-            subtitle_streams = []
-            for video_file in video_files:
-                if self.extractor.cancel_flag:
-                    break
-                    
-                streams = self.extractor.get_subtitle_streams(video_file)
-                matching_streams = [
-                    {'video_file': video_file, 'stream': stream}
-                    for stream in streams
-                    if stream['language'] == language
-                ]
-                
-                subtitle_streams.extend(matching_streams)
-                
-                # Update progress (based on scan progress)
-                self.update_ui_progress(
-                    len(subtitle_streams),
-                    len(video_files),
-                    f"Scanning: {os.path.basename(video_file)}"
-                )
+            # Files whose subtitle already exists don't need to be probed at all
+            skipped_files = 0
+            if not overwrite:
+                remaining_files = self.extractor.filter_existing(video_files, language, output_format, output_dir)
+                skipped_files = len(video_files) - len(remaining_files)
+                video_files = remaining_files
             
-            # Update total streams count
-            self.extractor.total_streams = len(subtitle_streams)
-            if subtitle_streams:
-                self.log_message(f"Found {len(subtitle_streams)} subtitle streams matching language '{language}'.")
-            else:
-                self.log_message(f"No subtitle streams found matching language '{language}'.")
-                self.finish_extraction()
-                return
-            
-            # Extract subtitles
-            self.extractor.processed_streams = 0
-            for item in subtitle_streams:
+            # Extract matching streams as soon as their file has been probed
+            self.extractor.total_streams = skipped_files
+            self.extractor.processed_streams = skipped_files
+            pending_slots = threading.BoundedSemaphore(MAX_PENDING_EXTRACTIONS)
+            for video_file, streams in self.extractor.probe_all(video_files, language):
                 if self.extractor.cancel_flag:
                     break
                 
-                video_file = item['video_file']
-                stream = item['stream']
+                # Streams that would overwrite each other are skipped without being queued
+                selected_streams = self.extractor.drop_duplicate_outputs(video_file, streams, language)
+                skipped_streams = len(streams) - len(selected_streams)
+                if skipped_streams:
+                    with self._progress_lock:
+                        self.extractor.total_streams += skipped_streams
+                        self.extractor.processed_streams += skipped_streams
                 
-                # Extract subtitle
-                self.extractor.extract_subtitle(
-                    video_file=video_file,
-                    stream_index=stream['index'],
-                    language=language,
-                    output_format=output_format,
-                    output_dir=output_dir,
-                    overwrite=self.overwrite_var.get()
-                )
+                for stream in selected_streams:
+                    pending_slots.acquire()
+                    if self.extractor.cancel_flag:
+                        pending_slots.release()
+                        break
+                    
+                    # Count the stream before its task can finish and report progress
+                    self.extractor.total_streams += 1
+                    future = self.pool.submit(
+                        self.extract_stream,
+                        pending_slots,
+                        video_file=video_file,
+                        stream_index=stream.index,
+                        language=language,
+                        output_format=output_format,
+                        output_dir=output_dir,
+                        overwrite=overwrite
+                    )
+                    futures.append(future)
                 
-                # Update progress
-                self.extractor.processed_streams += 1
+                # Show scan progress
                 self.update_ui_progress(
                     self.extractor.processed_streams,
                     self.extractor.total_streams,
-                    f"Extracting: {os.path.basename(video_file)}"
+                    "Scanning",
+                    video_file
                 )
             
+            if futures:
+                self.log_message(f"Found {len(futures)} subtitle streams matching language '{language}'.")
+            
+            # Wait for the remaining extractions, dropping queued ones on cancel
+            for future in as_completed(futures):
+                if self.extractor.cancel_flag:
+                    for pending in futures:
+                        pending.cancel()
+            
+            if not futures and not skipped_files and not self.extractor.cancel_flag:
+                self.log_message(f"No subtitle streams found matching language '{language}'.")
+                return
+            
             # Finished
             if self.extractor.cancel_flag:
                 self.log_message("Extraction cancelled by user.")
@@ -842,17 +1382,77 @@ class SubtitleExtractorGUI(ctk.CTk):
                 
         except Exception as e:
             self.log_message(f"ERROR: An unexpected error occurred: {str(e)}")
+            # Don't start the extractions still queued for this session
+            for future in futures:
+                future.cancel()
         finally:
-            self.finish_extraction()
+            # Running extractions still update the counters that the next
+            # session resets, so the session only ends once they are done
+            wait(futures)
+            # Tk widgets may only be touched from the main thread; queued after
+            # the last progress event so it can't overwrite the final state
+            self._events.put(("finish",))
     
-    def update_ui_progress(self, current, total, message="Processing"):
-        """Update UI elements from the worker thread"""
-        self.after(0, lambda: self.update_progress(current, total))
-        self.after(0, lambda: self.progress_label.configure(text=message))
+    def extract_stream(self, pending_slots, video_file, **kwargs):
+        """
+        Extract one subtitle stream and report progress (runs on a worker thread)
+        
+        Progress is posted before the task's future completes, so it is always
+        in place by the time run_extraction posts the "finish" event.
+        """
+        try:
+            # Tasks still queued when cancel was requested don't start ffmpeg at all
+            if self.extractor.cancel_flag:
+                return
+            
+            try:
+                self.extractor.extract_subtitle(video_file=video_file, **kwargs)
+            except Exception as e:
+                # e.g. an unusable output directory or ffmpeg failing to start
+                video_basename = os.path.splitext(os.path.basename(video_file))[0]
+                self.log_message(f"ERROR: Failed to extract subtitle from {video_basename} [{kwargs.get('language')}]: {str(e)}")
+                self.extractor.record_failure()
+            
+            # Post under the lock too, so the GUI never sees the count go backwards
+            with self._progress_lock:
+                self.extractor.processed_streams += 1
+                self.update_ui_progress(
+                    self.extractor.processed_streams,
+                    self.extractor.total_streams,
+                    "Extracting",
+                    video_file
+                )
+        finally:
+            pending_slots.release()
+    
+    def update_ui_progress(self, current, total, message="Processing", video_file=None):
+        """
+        Post progress from a worker thread; only the latest value is kept for _drain_progress
+        
+        The video file's name is only added to the message when it is drawn,
+        so progress that gets replaced before then costs no string work.
+        """
+        with self._latest_progress_lock:
+            self._latest_progress = (current, total, message, video_file)
+    
+    def _drain_progress(self):
+        """Draw the latest posted progress (at most ~30 times per second)"""
+        with self._latest_progress_lock:
+            progress, self._latest_progress = self._latest_progress, None
+        
+        if progress is not None:
+            current, total, message, video_file = progress
+            if video_file is not None:
+                message = f"{message}: {os.path.basename(video_file)}"
+            self.update_progress(current, total)
+            self.progress_label.configure(text=message)
+        
+        self.after(33, self._drain_progress)
     
     def cancel_extraction(self):
         """Cancel the extraction process"""
-        if self.extraction_thread and self.extraction_thread.is_alive():
+        if self.extraction_future and not self.extraction_future.done():
+            self.extraction_future.cancel()
             self.extractor.cancel()
             self.cancel_btn.configure(state="disabled")
             self.progress_label.configure(text="Cancelling...")
@@ -861,6 +1461,10 @@ class SubtitleExtractorGUI(ctk.CTk):
     
     def finish_extraction(self):
         """Cleanup after extraction is finished"""
+        # Drop progress that hasn't been drawn yet, the final state is set below
+        with self._latest_progress_lock:
+            self._latest_progress = None
+        
         # Update UI state
         self.extract_btn.configure(state="normal")
         self.cancel_btn.configure(state="disabled")
@@ -888,12 +1492,12 @@ class SubtitleExtractorGUI(ctk.CTk):
                     
                     if hasattr(self, 'start_time'):
                         elapsed = time.time() - self.start_time
-                        elapsed_str = str(timedelta(seconds=int(elapsed))).split('.')[0]
+                        elapsed_str = _fmt_hms(elapsed)
                         self.log_message(f"Total time: {elapsed_str}")
                     self.log_message("=" * 40)
                     
-                    # Show completion notification
-                    messagebox.showinfo(
+                    # Show completion notification without blocking the window
+                    self._show_toast(
                         "Extraction Complete", 
                         f"Processed {streams_processed} subtitle streams\n\n"
                         f"✓ Successful: {successful}\n"
@@ -903,6 +1507,36 @@ class SubtitleExtractorGUI(ctk.CTk):
         else:
             self.progress_bar.set(0)  # Reset to 0
             self.progress_label.configure(text="Ready")
+    
+    def _show_toast(self, title, message):
+        """Show a notification next to the main window that closes itself (or on click)"""
+        self._close_toast()
+        
+        toast = ctk.CTkToplevel(self)
+        toast.title(title)
+        toast.resizable(False, False)
+        toast.transient(self)
+        label = ctk.CTkLabel(toast, text=message, justify="left")
+        label.pack(padx=20, pady=15)
+        
+        # Place it in the bottom-right corner of the main window
+        toast.update_idletasks()
+        x = self.winfo_rootx() + self.winfo_width() - toast.winfo_reqwidth() - 20
+        y = self.winfo_rooty() + self.winfo_height() - toast.winfo_reqheight() - 20
+        toast.geometry(f"+{max(x, 0)}+{max(y, 0)}")
+        
+        toast.bind("<Button-1>", lambda event: self._close_toast())
+        label.bind("<Button-1>", lambda event: self._close_toast())
+        self._toast = toast
+        self.after(TOAST_DURATION_MS, self._close_toast, toast)
+    
+    def _close_toast(self, toast=None):
+        """Close the shown notification (only if it is still the given one)"""
+        if self._toast is None or (toast is not None and toast is not self._toast):
+            return
+        if self._toast.winfo_exists():
+            self._toast.destroy()
+        self._toast = None
 
 if __name__ == "__main__":
     app = SubtitleExtractorGUI()